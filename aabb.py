@@ -21,6 +21,37 @@ from primitive import G_OBJ_CUBE
 EPSILON = 1e-6  # small tolerance to avoid divide-by-zero / precision issues
 
 
+def ray_hit_batch(origin, direction, models, minimums, maximums):
+    """
+    Slab test of one ray against N boxes at once (same math as AABB.ray_hit).
+
+    origin, direction: 3D ray in the space the `models` map into.
+    models:   (N,4,4) box-space → ray-space transforms, one per box.
+    minimums, maximums: (N,3) box corners in each box's local space.
+
+    Returns (hit, t): an (N,) bool mask and the (N,) entry distances.
+    """
+    axes  = models[:, :3, :3]               # row i = i-th box axis in ray space
+    delta = models[:, :3, 3] - origin       # box centres relative to the ray
+    e = numpy.einsum('nij,nj->ni', axes, delta)
+    f = numpy.einsum('nij,j->ni',  axes, direction)
+
+    parallel = numpy.abs(f) <= EPSILON
+    inv_f    = numpy.divide(1.0, f, out=numpy.zeros_like(f), where=~parallel)
+    t1 = (e + minimums) * inv_f
+    t2 = (e + maximums) * inv_f
+
+    # Parallel slabs put no bound on t; they only reject if the origin (at -e
+    # along the axis) is outside
+    lo = numpy.where(parallel, -numpy.inf, numpy.minimum(t1, t2))
+    hi = numpy.where(parallel,  numpy.inf, numpy.maximum(t1, t2))
+    outside = parallel & ((minimums + e > EPSILON) | (maximums + e < -EPSILON))
+
+    t_min = numpy.maximum(lo.max(axis=1), 0.0)
+    t_max = numpy.minimum(hi.min(axis=1), 1e6)
+    return (t_max >= t_min) & ~outside.any(axis=1), t_min
+
+
 class AABB(object):
     def __init__(self, centre, size):
         """
@@ -47,33 +78,15 @@ class AABB(object):
           the transformed box axes. Keep a running [t_min, t_max] interval of
           valid ray distances. If the interval collapses, there's no hit.
         - Return (True, distance) for the closest hit along the ray.
+
+        Convenience for testing one box; it is not on the picking path.
+        Scene.pick tests every node in one ray_hit_batch call, and this just
+        wraps that kernel so there is a single copy of the slab math.
         """
-        minimum = self.centre - self.size
-        maximum = self.centre + self.size
-
-        t_min, t_max = 0.0, 1e6
-        obb_pos = model[:3, 3]             # box center in ray space
-        delta   = obb_pos - origin
-
-        for i in range(3):                  # test each axis of the (oriented) box
-            axis = model[i, :3]             # the i-th local axis under transform
-            e    = numpy.dot(axis, delta)
-            f    = numpy.dot(direction, axis)
-
-            if abs(f) > EPSILON:            # regular case: compute t for each slab
-                t1 = (e + minimum[i]) / f
-                t2 = (e + maximum[i]) / f
-                if t1 > t2:
-                    t1, t2 = t2, t1
-                t_min = max(t_min, t1)
-                t_max = min(t_max, t2)
-                if t_max < t_min:           # interval collapsed → miss
-                    return False, 0.0
-            else:
-                # Ray is parallel to this slab: reject if origin not between faces
-                if -e + minimum[i] > EPSILON or -e + maximum[i] < -EPSILON:
-                    return False, 0.0
-        return True, t_min
+        hit, t = ray_hit_batch(origin, direction, model[numpy.newaxis],
+                               (self.centre - self.size)[numpy.newaxis],
+                               (self.centre + self.size)[numpy.newaxis])
+        return bool(hit[0]), float(t[0]) if hit[0] else 0.0
 
     def render(self):
         """Draw a unit cube at the AABB center (wireframe) — purely visual aid."""
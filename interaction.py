@@ -2,13 +2,13 @@
 interaction.py — Translates OS input (GLUT) into app-level events.
 
 - Handles mouse buttons/motion, keyboard, and arrow keys.
-- Exposes a small callback bus: 'pick', 'move', 'place', 'rotate_color', 'scale'.
+- Exposes a small callback bus: 'pick', 'move', 'place', 'rotate_color', 'scale',
+  plus 'view_changed' whenever the trackball or scene translation moves.
 - Also maintains an orbital trackball (right-drag) and scene translation.
 
 Viewer registers handlers here; Scene doesn't need to know about GLUT.
 """
 
-from collections import defaultdict
 from OpenGL.GLUT import (
     glutGet, glutMouseFunc, glutMotionFunc, glutKeyboardFunc, glutSpecialFunc,
     glutPostRedisplay, GLUT_WINDOW_WIDTH, GLUT_WINDOW_HEIGHT,
@@ -17,6 +17,10 @@ from OpenGL.GLUT import (
 )
 import trackball
 
+# freeglut reports mouse-wheel steps as presses of these extra buttons
+WHEEL_UP_BUTTON   = 3
+WHEEL_DOWN_BUTTON = 4
+
 
 class Interaction(object):
     def __init__(self):
@@ -24,7 +28,13 @@ class Interaction(object):
         self.trackball    = trackball.Trackball(theta=-25, distance=15)
         self.translation  = [0, 0, 0, 0]         # x,y,z shift of the whole scene
         self.mouse_loc    = None                 # last mouse position (x,y)
-        self.callbacks    = defaultdict(list)    # event -> [handlers]
+        self._single_callbacks = {}              # event -> its only handler
+        self._multi_callbacks  = {}              # event -> [handlers], if 2+
+        self._button_handlers  = {               # button press -> action(x, y)
+            GLUT_LEFT_BUTTON:  lambda x, y: self.trigger('pick', x, y),  # select
+            WHEEL_UP_BUTTON:   lambda x, y: self.translate(0, 0, 1.0),   # zoom in
+            WHEEL_DOWN_BUTTON: lambda x, y: self.translate(0, 0, -1.0),  # zoom out
+        }
         self.register()
 
     # -------- GLUT registration ---------------------------------------
@@ -40,14 +50,29 @@ class Interaction(object):
         self.translation[0] += x
         self.translation[1] += y
         self.translation[2] += z
+        self.trigger('view_changed')
 
     def register_callback(self, name, func):
-        """Viewer uses this to hook scene operations to events."""
-        self.callbacks[name].append(func)
+        """
+        Viewer uses this to hook scene operations to events. Every event has
+        one listener today, so keep a lone handler out of a list and only
+        switch to list dispatch once a second one registers.
+        """
+        if name in self._multi_callbacks:
+            self._multi_callbacks[name].append(func)
+        elif name in self._single_callbacks:
+            first = self._single_callbacks.pop(name)
+            self._multi_callbacks[name] = [first, func]
+        else:
+            self._single_callbacks[name] = func
 
     def trigger(self, name, *args, **kw):
         """Dispatch app-level event to all registered listeners."""
-        for cb in self.callbacks[name]:
+        cb = self._single_callbacks.get(name)
+        if cb is not None:
+            cb(*args, **kw)
+            return
+        for cb in self._multi_callbacks.get(name, ()):
             cb(*args, **kw)
 
     # -------- low-level event handlers --------------------------------
@@ -59,12 +84,9 @@ class Interaction(object):
 
         if mode == GLUT_DOWN:
             self.pressed = button
-            if button == GLUT_LEFT_BUTTON:
-                self.trigger('pick', x, y)               # select node under cursor
-            elif button == 3:                             # wheel up → zoom in
-                self.translate(0, 0, 1.0)
-            elif button == 4:                             # wheel down → zoom out
-                self.translate(0, 0, -1.0)
+            handler = self._button_handlers.get(button)
+            if handler:
+                handler(x, y)
         else:
             self.pressed = None
         glutPostRedisplay()
@@ -78,6 +100,7 @@ class Interaction(object):
             if self.pressed == GLUT_RIGHT_BUTTON and self.trackball:
                 # Orbit around origin (camera rotation)
                 self.trackball.drag_to(self.mouse_loc[0], self.mouse_loc[1], dx, dy)
+                self.trigger('view_changed')
             elif self.pressed == GLUT_LEFT_BUTTON:
                 # Move selected node to follow the cursor's ray
                 self.trigger('move', x, y)
@@ -98,11 +121,11 @@ class Interaction(object):
         elif key == b'c' or key == 'c': self.trigger('place', 'cube',   x, y)
 
         # Scale selected node (up/down arrows)
-        elif key == GLUT_KEY_UP      : self.trigger('scale', up=True)
-        elif key == GLUT_KEY_DOWN    : self.trigger('scale', up=False)
+        elif key == GLUT_KEY_UP      : self.trigger('scale', True)
+        elif key == GLUT_KEY_DOWN    : self.trigger('scale', False)
 
         # Cycle color (left/right arrows)
-        elif key == GLUT_KEY_LEFT    : self.trigger('rotate_color', forward=True)
-        elif key == GLUT_KEY_RIGHT   : self.trigger('rotate_color', forward=False)
+        elif key == GLUT_KEY_LEFT    : self.trigger('rotate_color', True)
+        elif key == GLUT_KEY_RIGHT   : self.trigger('rotate_color', False)
 
         glutPostRedisplay()
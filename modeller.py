@@ -1,5 +1,6 @@
 from OpenGL.GL import *
 from OpenGL.GLU import *
+import numpy
 import pygame
 from pygame.locals import *
 
@@ -9,6 +10,16 @@ pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
 gluPerspective(45, (display[0] / display[1]), 0.1, 50.0)
 glTranslatef(0.0, 0.0, -5)
 
+# Upload the triangle once; each frame then draws it with a single call
+verts = numpy.array([[0.0, 1.0, 0.0],
+                     [-1.0, -1.0, 0.0],
+                     [1.0, -1.0, 0.0]], dtype=numpy.float32)
+vbo = glGenBuffers(1)
+glBindBuffer(GL_ARRAY_BUFFER, vbo)
+glBufferData(GL_ARRAY_BUFFER, verts.nbytes, verts, GL_STATIC_DRAW)
+glEnableClientState(GL_VERTEX_ARRAY)
+glVertexPointer(3, GL_FLOAT, 0, None)
+
 while True:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -16,10 +27,6 @@ while True:
             quit()
 
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-    glBegin(GL_TRIANGLES)
-    glVertex3f(0.0, 1.0, 0.0)
-    glVertex3f(-1.0, -1.0, 0.0)
-    glVertex3f(1.0, -1.0, 0.0)
-    glEnd()
+    glDrawArrays(GL_TRIANGLES, 0, len(verts))
     pygame.display.flip()
     pygame.time.wait(10)
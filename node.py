@@ -9,29 +9,23 @@ Key ideas:
 
 import random
 import numpy
-from numpy.linalg import inv
 from OpenGL.GL import (
-    glPushMatrix, glPopMatrix, glCallList, glMultMatrixf, glColor3f,
-    glMaterialfv, GL_FRONT, GL_EMISSION
+    glPushMatrix, glPopMatrix, glCallList, glMultTransposeMatrixf, glColor3f,
+    glMaterialfv, glGenLists, glNewList, glEndList,
+    GL_FRONT, GL_EMISSION, GL_COMPILE
 )
 import color
 from aabb import AABB
 from primitive import G_OBJ_CUBE, G_OBJ_SPHERE
 
 
-# ---------- tiny transform constructors (column-major-friendly) -------------
+# ---------- tiny transform constructor -------------------------------------
 def scaling(s):
     """Return a 4x4 uniform/non-uniform scale matrix from (sx, sy, sz)."""
     m = numpy.identity(4, dtype=float)
     m[0, 0], m[1, 1], m[2, 2] = s
     return m
 
-def translation(t):
-    """Return a 4x4 translation matrix from (tx, ty, tz)."""
-    m = numpy.identity(4, dtype=float)
-    m[0, 3], m[1, 3], m[2, 3] = t
-    return m
-
 
 # ------------------------------- Node (abstract) ----------------------------
 class Node(object):
@@ -42,21 +36,23 @@ class Node(object):
         self.translation_matrix = numpy.identity(4, dtype=float)
         self.scaling_matrix     = numpy.identity(4, dtype=float)
         self.selected           = False    # drives highlight in render()
+        self._scene_idx         = None     # row in the Scene's pick arrays
+        # Caches derived from the transforms, see _transform_changed()
+        self._inv_scaling       = numpy.identity(4, dtype=float)
+        self._transform_changed()
 
     def render(self):
         """
         - Push current ModelView.
-        - Apply this node's translation and scale.
+        - Apply this node's translation and scale (one fused matrix).
         - Set color (and a little emission if selected).
         - Call subclass's render_self() to actually draw geometry.
         - Pop ModelView.
         """
         glPushMatrix()
-        # OpenGL expects column-major floats; numpy uses row-major.
-        # The original code transposes translation, but not scaling; this works
-        # because scaling_matrix is already constructed to match how OpenGL reads it.
-        glMultMatrixf(numpy.transpose(self.translation_matrix))
-        glMultMatrixf(self.scaling_matrix)
+        # OpenGL expects column-major floats; numpy uses row-major, so let GL
+        # take the row-major float32 _gl_model as-is and transpose it itself.
+        glMultTransposeMatrixf(self._gl_model)
 
         r, g, b = color.COLORS[self.color_index]
         glColor3f(r, g, b)
@@ -76,26 +72,55 @@ class Node(object):
     # -------- transforms ------------------------------------------------------
     def translate(self, dx, dy, dz):
         """Post-multiply a translation (moves in the node's current local space)."""
-        self.translation_matrix = numpy.dot(self.translation_matrix,
-                                            translation([dx, dy, dz]))
+        # Invariant: translation_matrix is identity plus a translation column
+        # (only this method writes it), so post-multiplying by a translation
+        # just adds d to that column. T * inv(S) and T * S share the column
+        # and the bounding radius doesn't change: patch the caches instead of
+        # a full refresh (_world_centre is a view of it, so it follows).
+        t = self.translation_matrix[:3, 3]
+        t += dx, dy, dz
+        self._pick_transform[:3, 3] = t
+        self._gl_model[:3, 3]       = t
 
     def scale(self, up=True):
         """Uniformly scale node and its AABB for visual consistency."""
-        s = 1.1 if up else 0.9
+        self._scale_by(1.1 if up else 0.9)
+
+    def _scale_by(self, s):
         self.scaling_matrix = numpy.dot(self.scaling_matrix, scaling([s, s, s]))
+        self._inv_scaling[:3, :3] /= s      # diagonal, so no general inverse
         self.aabb.scale(s)
+        self._transform_changed()
+
+    def _transform_changed(self):
+        """
+        Refresh the caches derived from the transforms and AABB:
+        - _pick_transform: T * inv(S), the node part of the pick matrix.
+        - _gl_model: float32 T * S, so render() never converts or multiplies.
+        - _world_centre/_world_radius: a world-space sphere around the pick
+          box (for a rigid modelview), used to cull nodes before picking.
+        """
+        self._pick_transform = numpy.dot(self.translation_matrix,
+                                         self._inv_scaling)
+        self._gl_model = numpy.dot(self.translation_matrix,
+                                   self.scaling_matrix).astype(numpy.float32)
+        max_scale = numpy.abs(numpy.diagonal(self.scaling_matrix)[:3]).max()
+        self._world_centre = self.translation_matrix[:3, 3]   # live view
+        self._world_radius = max_scale * numpy.linalg.norm(
+            numpy.abs(self.aabb.centre) + self.aabb.size)
 
     # -------- picking helpers -------------------------------------------------
     def pick(self, origin, direction, modelview):
         """
         Ray test vs. this node's AABB (approximate). We need to account
         for the node's transforms: M = MV * T * inv(S), so the unit AABB
-        matches the on-screen scaled+translated geometry.
+        matches the on-screen scaled+translated geometry (T * inv(S) is
+        cached as _pick_transform).
+
+        Single-node convenience, not used by Scene.pick, which tests all
+        nodes at once from its own arrays.
         """
-        transform = numpy.dot(
-            numpy.dot(modelview, self.translation_matrix),
-            inv(self.scaling_matrix)
-        )
+        transform = numpy.dot(modelview, self._pick_transform)
         return self.aabb.ray_hit(origin, direction, transform)
 
     def select(self, state=None):
@@ -104,11 +129,8 @@ class Node(object):
 
     def rotate_color(self, forward=True):
         """Cycle through palette (left/right arrows)."""
-        self.color_index += 1 if forward else -1
-        if self.color_index > color.MAX_COLOR:
-            self.color_index = color.MIN_COLOR
-        if self.color_index < color.MIN_COLOR:
-            self.color_index = color.MAX_COLOR
+        step = 1 if forward else -1
+        self.color_index = (self.color_index + step) % len(color.COLORS)
 
 
 # ------------------------------ Primitive nodes -----------------------------
@@ -130,9 +152,24 @@ class HierarchicalNode(Node):
     """Composite node that renders a list of children with its transform."""
     def __init__(self):
         super(HierarchicalNode, self).__init__()
-        self.children = []
+        self.children    = []
+        self._baked_list = None    # display list id once children are baked
+
+    def bake(self):
+        """
+        Record the children's draw calls into one display list, for
+        composites whose children never change after construction.
+        """
+        self._baked_list = glGenLists(1)
+        glNewList(self._baked_list, GL_COMPILE)
+        for c in self.children:
+            c.render()
+        glEndList()
 
     def render_self(self):
+        if self._baked_list is not None:
+            glCallList(self._baked_list)
+            return
         for c in self.children:
             c.render()
 
@@ -147,10 +184,8 @@ class SnowFigure(HierarchicalNode):
         self.children[1].translate(0,  0.1, 0)
         self.children[2].translate(0,  0.75, 0)
 
-        self.children[1].scaling_matrix = numpy.dot(
-            self.scaling_matrix, scaling([0.8, 0.8, 0.8]))
-        self.children[2].scaling_matrix = numpy.dot(
-            self.scaling_matrix, scaling([0.7, 0.7, 0.7]))
+        self.children[1]._scale_by(0.8)
+        self.children[2]._scale_by(0.7)
 
         # Make the snowman white initially
         for c in self.children:
@@ -158,3 +193,7 @@ class SnowFigure(HierarchicalNode):
 
         # Taller AABB to enclose the whole stack
         self.aabb = AABB([0, 0, 0], [0.5, 1.1, 0.5])
+        self._transform_changed()
+
+        # The stack is static: one glCallList instead of 3 child renders
+        self.bake()
@@ -7,7 +7,7 @@ glCallList(...) per primitive. This keeps per-frame code simple and small.
 
 from OpenGL.GL import *
 from OpenGL.GLUT import *
-import numpy  # (not strictly required here, but often useful)
+import numpy
 
 # Display-list IDs (arbitrary unique integers)
 G_OBJ_CUBE   = 1
@@ -30,11 +30,25 @@ def init_primitives():
     glEndList()
 
     # ---- ground plane grid -------------------------------------------
-    glNewList(G_OBJ_PLANE, GL_COMPILE)
+    # Per tick i: a line along Z at x=i and a line along X at z=i
     size, step = 20, 1
-    glBegin(GL_LINES)
-    for i in range(-size, size + 1, step):
-        glVertex3f(i, 0, -size); glVertex3f(i, 0,  size)
-        glVertex3f(-size, 0, i); glVertex3f( size, 0, i)
-    glEnd()
+    ticks = numpy.arange(-size, size + 1, step, dtype=numpy.float32)
+    verts = numpy.zeros((len(ticks), 4, 3), dtype=numpy.float32)
+    verts[:, 0:2, 0] = ticks[:, numpy.newaxis]
+    verts[:, 0:2, 2] = (-size, size)
+    verts[:, 2:4, 0] = (-size, size)
+    verts[:, 2:4, 2] = ticks[:, numpy.newaxis]
+    verts = verts.reshape(-1, 3)
+
+    # Compiling glDrawArrays copies the vertex data into the list itself, so a
+    # client-side array is enough (buffer binds can't be recorded in a list).
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, verts)
+    # The grid is drawn unlit for contrast; the toggle lives in the list so
+    # the caller doesn't flip lighting around it every frame.
+    glNewList(G_OBJ_PLANE, GL_COMPILE)
+    glDisable(GL_LIGHTING)
+    glDrawArrays(GL_LINES, 0, len(verts))
+    glEnable(GL_LIGHTING)
     glEndList()
+    glDisableClientState(GL_VERTEX_ARRAY)
@@ -11,8 +11,9 @@ Design:
   and higher-level IO concerns to Viewer/Interaction.
 """
 
-import sys
 import numpy
+from numpy.linalg import inv
+from aabb import EPSILON, ray_hit_batch
 from node import Sphere, Cube, SnowFigure
 
 class Scene(object):
@@ -22,36 +23,128 @@ class Scene(object):
     def __init__(self):
         self.node_list     = []
         self.selected_node = None
+        # Pick data as structure-of-arrays, row i ↔ node_list[i] (node._scene_idx).
+        # Rows past len(node_list) are spare capacity, see _grow().
+        self._transforms   = numpy.zeros((0, 4, 4))               # T * inv(S)
+        self._aabb_centres = numpy.zeros((0, 3), dtype=numpy.float32)
+        self._aabb_sizes   = numpy.zeros((0, 3), dtype=numpy.float32)
+        self._world_centres = numpy.zeros((0, 3))        # bounding spheres for
+        self._world_radii   = numpy.zeros(0)             # cheap ray culling
+        # Homogeneous scratch vectors reused by every move/place event
+        self._vec4_move    = numpy.zeros(4)                   # w=0: a direction
+        self._vec4_place   = numpy.array([0.0, 0.0, 0.0, 1.0])  # w=1: a point
 
     # ---------- content management ------------------------------------
     def add_node(self, n):
+        i = n._scene_idx = len(self.node_list)
         self.node_list.append(n)
+        if i == len(self._world_radii):
+            self._grow(max(2 * i, 16))
+        self._node_changed(n)
+
+    def _grow(self, capacity):
+        """
+        Reallocate the pick arrays with room for `capacity` rows. Doubling
+        keeps add_node amortized O(1) instead of copying every array per add.
+        """
+        def resized(a):
+            out = numpy.zeros((capacity,) + a.shape[1:], dtype=a.dtype)
+            out[:len(a)] = a
+            return out
+        self._transforms    = resized(self._transforms)
+        self._aabb_centres  = resized(self._aabb_centres)
+        self._aabb_sizes    = resized(self._aabb_sizes)
+        self._world_centres = resized(self._world_centres)
+        self._world_radii   = resized(self._world_radii)
+
+    def _node_changed(self, n):
+        """Copy a node's new transform/AABB into its row of the pick arrays."""
+        i = n._scene_idx
+        self._transforms[i]   = n._pick_transform
+        self._aabb_centres[i] = n.aabb.centre
+        self._aabb_sizes[i]   = n.aabb.size
+        self._world_centres[i] = n._world_centre
+        self._world_radii[i]   = n._world_radius
+
+    def _node_moved(self, n):
+        """Like _node_changed, after a pure translation of n."""
+        i = n._scene_idx
+        self._transforms[i, :3, 3] = n._world_centre
+        self._world_centres[i]     = n._world_centre
 
     def render(self):
         for n in self.node_list:
             n.render()
 
     # ---------- selection & manipulation -------------------------------
-    def pick(self, origin, direction, modelview):
+    def pick(self, origin, direction, modelview, inv_model=None):
         """
         Select the closest node whose AABB is hit by the ray (origin+ t*direction).
-        modelview: current MV matrix to be passed into nodes' pick(...) helpers.
+        modelview: current MV matrix; maps every node's box into ray space.
+        inv_model: inv(modelview), if the caller already has it cached.
         """
         if self.selected_node:
             self.selected_node.select(False)
             self.selected_node = None
 
-        mindist, closest = sys.maxsize, None
-        for n in self.node_list:
-            hit, dist = n.pick(origin, direction, modelview)
-            if hit and dist < mindist:
-                mindist, closest = dist, n
+        if not self.node_list:
+            return
 
-        if closest:
-            closest.select(True)
-            closest.depth        = mindist               # store hit distance
-            closest.selected_loc = origin + direction * mindist
-            self.selected_node   = closest
+        # The same ray in world space (inv(MV) keeps t: origin + t*dir maps to
+        # origin' + t*dir'), where the cached bounding spheres live
+        to_world = inv(modelview) if inv_model is None else inv_model
+        w_origin = to_world[:3, :3].dot(origin) + to_world[:3, 3]
+        w_dir    = to_world[:3, :3].dot(direction)
+        # |inv(L)|^2 is 1 for the rigid modelview the viewer builds; it is
+        # only a safety margin should MV ever carry scale (one 3x3 SVD/pick)
+        grow = numpy.linalg.norm(to_world[:3, :3], 2) ** 2
+
+        found = self._closest_hit(origin, direction, modelview,
+                                  w_origin, w_dir, grow)
+        if found is None:
+            return
+        mindist, i = found
+        closest    = self.node_list[i]
+
+        closest.select(True)
+        closest.depth        = mindist                   # store hit distance
+        closest.selected_loc = origin + direction * mindist
+        self.selected_node   = closest
+
+    def _closest_hit(self, origin, direction, modelview, w_origin, w_dir, grow):
+        """
+        One slab test over all nodes: M = MV * T * inv(S), see Node.pick.
+        w_origin, w_dir: the same ray in world space; grow: |inv(L)|^2 below.
+        Returns (distance, node index) of the first of the closest hits, or
+        None. Nodes whose bounding sphere the ray misses (perpendicular
+        distance > radius) are dropped first.
+
+        A pick box is {p : min <= A (p - pos) <= max} with A, pos taken from
+        MV * T * inv(S), so its shape in world space depends on the modelview.
+        It always lies within |inv(L)|^2 * max_scale * |corner| of the node's
+        origin, though (L = modelview 3x3): nodes cache the camera-free part
+        as _world_radius, and grow supplies the |inv(L)|^2 factor.
+        """
+        n     = len(self.node_list)
+        to_c  = self._world_centres[:n] - w_origin
+        dd    = w_dir.dot(w_dir)
+        along = to_c.dot(w_dir)
+        perp2 = numpy.einsum('ij,ij->i', to_c, to_c) - along * along / dd
+        reach = grow * self._world_radii[:n] + EPSILON
+        idx   = numpy.flatnonzero(perp2 <= reach * reach)
+        if not idx.size:
+            return None
+
+        models  = numpy.matmul(modelview, self._transforms[idx])
+        centres = self._aabb_centres[idx]
+        sizes   = self._aabb_sizes[idx]
+        hit, dist = ray_hit_batch(origin, direction, models,
+                                  centres - sizes, centres + sizes)
+        hits = numpy.flatnonzero(hit)
+        if not hits.size:
+            return None
+        best = hits[numpy.argmin(dist[hits])]
+        return dist[best], idx[best]
 
     def rotate_selected_color(self, forward):
         if self.selected_node:
@@ -60,6 +153,7 @@ class Scene(object):
     def scale_selected(self, up):
         if self.selected_node:
             self.selected_node.scale(up)
+            self._node_changed(self.selected_node)
 
     def move_selected(self, origin, direction, inv_model):
         """
@@ -76,10 +170,11 @@ class Scene(object):
         old   = node.selected_loc
         new   = origin + direction * depth
 
-        delta = new - old
-        delta = inv_model.dot(numpy.array([delta[0], delta[1], delta[2], 0]))
+        numpy.subtract(new, old, out=self._vec4_move[:3])
+        delta = inv_model.dot(self._vec4_move)
         node.translate(*delta[:3])
         node.selected_loc = new
+        self._node_moved(node)
 
     def place(self, shape, origin, direction, inv_model):
         """
@@ -89,6 +184,7 @@ class Scene(object):
         new = {'sphere': Sphere, 'cube': Cube, 'figure': SnowFigure}[shape]()
         self.add_node(new)
 
-        loc = origin + direction * self.PLACE_DEPTH
-        loc = inv_model.dot(numpy.array([loc[0], loc[1], loc[2], 1]))
+        self._vec4_place[:3] = origin + direction * self.PLACE_DEPTH
+        loc = inv_model.dot(self._vec4_place)
         new.translate(*loc[:3])
+        self._node_moved(new)
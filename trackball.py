@@ -22,64 +22,68 @@ directly.
 """
 
 import math
+import numpy
 import OpenGL.GL as gl
-from OpenGL.GL import GLfloat
-
-# ----- small vector helpers -------------------------------------------------
-def _v_add(v1, v2):  return [v1[0]+v2[0], v1[1]+v2[1], v1[2]+v2[2]]
-def _v_sub(v1, v2):  return [v1[0]-v2[0], v1[1]-v2[1], v1[2]-v2[2]]
-def _v_mul(v, s):    return [v[0]*s, v[1]*s, v[2]*s]
-def _v_dot(v1, v2):  return v1[0]*v2[0] + v1[1]*v2[1] + v1[2]*v2[2]
-def _v_cross(v1, v2):
-    return [(v1[1]*v2[2]) - (v1[2]*v2[1]),
-            (v1[2]*v2[0]) - (v1[0]*v2[2]),
-            (v1[0]*v2[1]) - (v1[1]*v2[0])]
-def _v_length(v):    return math.sqrt(_v_dot(v, v))
-def _v_normalize(v):
-    try:  return _v_mul(v, 1.0 / _v_length(v))
-    except ZeroDivisionError: return v
-
-# ----- quaternion helpers (for robust rotation accumulation) ----------------
-def _q_add(q1, q2):
-    t1 = _v_mul(q1, q2[3])
-    t2 = _v_mul(q2, q1[3])
-    t3 = _v_cross(q2, q1)
-    tf = _v_add(t1, _v_add(t2, t3))
-    tf.append(q1[3]*q2[3] - _v_dot(q1, q2))
-    return tf
-def _q_mul(q, s):        return [q[0]*s, q[1]*s, q[2]*s, q[3]*s]
-def _q_dot(q1, q2):      return (q1[0]*q2[0] + q1[1]*q2[1] +
-                                 q1[2]*q2[2] + q1[3]*q2[3])
-def _q_length(q):        return math.sqrt(_q_dot(q, q))
-def _q_normalize(q):
-    try:  return _q_mul(q, 1.0 / _q_length(q))
-    except ZeroDivisionError: return q
-def _q_from_axis_angle(v, phi):
-    q = _v_mul(_v_normalize(v), math.sin(phi/2.0))
-    q.append(math.cos(phi/2.0))
-    return q
-def _q_rotmatrix(q):
-    """Convert quaternion to column-major 4x4 rotation matrix array."""
-    m = [0.0]*16
-    m[ 0] = 1 - 2*(q[1]*q[1] + q[2]*q[2])
-    m[ 1] =     2*(q[0]*q[1] - q[2]*q[3])
-    m[ 2] =     2*(q[2]*q[0] + q[1]*q[3])
-    m[ 5] = 1 - 2*(q[2]*q[2] + q[0]*q[0])
-    m[ 6] =     2*(q[1]*q[2] - q[0]*q[3])
-    m[ 8] =     2*(q[2]*q[0] - q[1]*q[3])
-    m[ 9] =     2*(q[1]*q[2] + q[0]*q[3])
-    m[10] = 1 - 2*(q[1]*q[1] + q[0]*q[0])
-    m[15] = 1.0
-    return m
+
+# ----- per-drag math (quaternions accumulate the rotation robustly) ----------
+# Quaternions are (x,y,z,w) and these functions work on plain Python floats.
+def _project(r, x, y):
+    """
+    Project 2D screen point onto a virtual sphere of radius r, blending
+    into a hyperbolic sheet outside r/sqrt(2). The test runs on d^2, so
+    each side takes exactly one sqrt (coordinates are in [-1,1]: no need
+    for hypot's overflow guard).
+    """
+    d2, half = x*x + y*y, 0.5*r*r
+    if d2 < half:
+        return math.sqrt(r*r - d2)   # inside sphere
+    return half / math.sqrt(d2)      # on hyperbolic sheet
+
+def _update(rotation, x, y, dx, dy, size, normalize=False):
+    """
+    One drag step: compose `rotation` with the drag from (x,y) by (dx,dy)
+    and return the new quaternion as a tuple.
+
+    Runs on every mouse move, so it is written on plain float locals; numpy
+    would cost more in dispatch than the few dozen flops of arithmetic.
+    """
+    q0, q1, q2, q3 = rotation
+    if dx or dy:
+        # drag start/end on the virtual sphere; axis = new x last
+        lx, ly, lz = x, y, _project(size, x, y)
+        nx, ny = x + dx, y + dy
+        nz = _project(size, nx, ny)
+        ax, ay, az = ny*lz - nz*ly, nz*lx - nx*lz, nx*ly - ny*lx
+        gx, gy, gz = lx - nx, ly - ny, lz - nz
+        t = math.sqrt(gx*gx + gy*gy + gz*gz) / (2*size)
+        t = 1.0 if t > 1.0 else t
+
+        # axis-angle with phi = 2*asin(t): sin(phi/2) = t
+        length = math.sqrt(ax*ax + ay*ay + az*az)
+        s  = t / length if length else t
+        p0, p1, p2, p3 = ax*s, ay*s, az*s, math.sqrt(1.0 - t*t)
+
+        # Hamilton product q*p: xyz = q_w p + p_w q + q x p, w = q_w p_w - q.p
+        q0, q1, q2, q3 = (q0*p3 + p0*q3 + q1*p2 - q2*p1,
+                          q1*p3 + p1*q3 + q2*p0 - q0*p2,
+                          q2*p3 + p2*q3 + q0*p1 - q1*p0,
+                          p3*q3 - (p0*q0 + p1*q1 + p2*q2))
+
+    if normalize:
+        # the accumulator is a unit quaternion plus drift, never zero
+        r = 1.0 / math.sqrt(q0*q0 + q1*q1 + q2*q2 + q3*q3)
+        q0, q1, q2, q3 = q0*r, q1*r, q2*r, q3*r
+
+    return q0, q1, q2, q3
 
 class Trackball(object):
     """Virtual trackball for intuitive 3D rotation; expose .matrix to GL."""
 
     def __init__(self, *, theta=0, phi=0, zoom=1, distance=3):
-        self._rotation = [0, 0, 0, 1]  # quaternion (x,y,z,w)
+        self._rotation = numpy.array([0.0, 0.0, 0.0, 1.0])  # quaternion (x,y,z,w)
         self._count    = 0
-        self._matrix   = None
-        self._RENORMCOUNT  = 97        # periodically renormalize quaternion
+        self._matrix   = numpy.zeros(16, dtype=numpy.float32)  # reused by GL
+        self._RENORMCOUNT  = 512       # periodically renormalize quaternion
         self._TRACKBALLSIZE = .8
 
         self.zoom     = zoom
@@ -102,15 +106,15 @@ class Trackball(object):
         dx = (2*dx) / w
         dy = (2*dy) / h
 
-        q = self._rotate(x, y, dx, dy)
-        self._rotation = _q_add(q, self._rotation)
-
         self._count += 1
-        if self._count > self._RENORMCOUNT:
-            self._rotation = _q_normalize(self._rotation)
+        normalize = self._count > self._RENORMCOUNT
+        if normalize:
             self._count = 0
 
-        self._matrix = (GLfloat * 16)(*_q_rotmatrix(self._rotation))
+        q = _update(self._rotation.tolist(), x, y, dx, dy,
+                    self._TRACKBALLSIZE, normalize)
+        self._rotation[:] = q
+        self._fill_matrix(q)
 
     # (zoom_to and pan_to exist for completeness; not used directly here)
     def zoom_to(self, _, __, ___, dy):
@@ -127,29 +131,25 @@ class Trackball(object):
 
     # ---- internal helpers ---------------------------------------------
     def _set_orientation(self, theta, phi):
-        """Seed orientation from Euler-ish angles (X then Z)."""
-        angle = math.radians(theta)
-        xrot  = [math.sin(angle/2), 0, 0, math.cos(angle/2)]
-        angle = math.radians(phi)
-        zrot  = [0, 0, math.sin(angle/2), math.cos(angle/2)]
-        self._rotation = _q_add(xrot, zrot)
-        self._matrix   = (GLfloat * 16)(*_q_rotmatrix(self._rotation))
-
-    def _project(self, r, x, y):
-        """Project 2D screen point onto a virtual sphere of radius r."""
-        d = math.hypot(x, y)
-        if d < r * 0.70710678:     # inside sphere
-            return math.sqrt(r*r - d*d)
-        t = r / 1.41421356         # on hyperbolic sheet
-        return t*t / d
-
-    def _rotate(self, x, y, dx, dy):
-        if not dx and not dy:
-            return [0, 0, 0, 1]
-        last = [x, y, self._project(self._TRACKBALLSIZE, x, y)]
-        new  = [x+dx, y+dy,
-                self._project(self._TRACKBALLSIZE, x+dx, y+dy)]
-        axis = _v_cross(new, last)
-        t    = _v_length(_v_sub(last, new)) / (2*self._TRACKBALLSIZE)
-        t    = max(-1, min(1, t))
-        return _q_from_axis_angle(axis, 2*math.asin(t))
\ No newline at end of file
+        """
+        Seed orientation from Euler-ish angles (X then Z): the product of
+        the two axis quaternions, written out in closed form.
+        """
+        st, ct = math.sin(math.radians(theta)/2), math.cos(math.radians(theta)/2)
+        sp, cp = math.sin(math.radians(phi)/2),   math.cos(math.radians(phi)/2)
+        self._rotation[:] = st*cp, st*sp, ct*sp, ct*cp
+        self._fill_matrix(self._rotation.tolist())
+
+    def _fill_matrix(self, q):
+        """
+        Write quaternion q as a column-major 4x4 rotation into _matrix, a
+        float32 array glMultMatrixf takes as is (one store, no ctypes).
+        """
+        x, y, z, w = q
+        xx, yy, zz = x*x, y*y, z*z
+        xy, xz, yz = x*y, x*z, y*z
+        xw, yw, zw = x*w, y*w, z*w
+        self._matrix[:] = (1 - 2*(yy + zz),     2*(xy - zw),     2*(xz + yw), 0.0,
+                               2*(xy + zw), 1 - 2*(zz + xx),     2*(yz - xw), 0.0,
+                               2*(xz - yw),     2*(yz + xw), 1 - 2*(yy + xx), 0.0,
+                           0.0,                 0.0,             0.0,         1.0)
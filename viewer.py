@@ -26,25 +26,49 @@ from scene import Scene
 from node import Sphere, Cube, SnowFigure
 
 
+def _rigid_inv(m, out):
+    """
+    Invert a 4x4 rigid transform m (rotation R plus translation t) into out.
+
+    The modelview here is only a translation times the trackball rotation,
+    so the inverse is R.T with the translation rotated back, -R.T t; no
+    general LU-based inv() per view change.
+    """
+    r_t = m[:3, :3].T
+    out[:3, :3] = r_t
+    out[:3, 3]  = -r_t.dot(m[:3, 3])
+    out[3]      = 0.0, 0.0, 0.0, 1.0
+    return out
+
+
 class Viewer(object):
     def __init__(self):
+        self._dirty = True  # view moved since modelView was last read back
         self.init_interface()
         self.init_opengl()
+        init_primitives()  # build display lists (before any node bakes its own)
         self.init_scene()
         self.init_interaction()
-        init_primitives()  # build display lists
 
     # ---------------------- GLUT / OpenGL init -------------------------
     def init_interface(self):
         glutInit()
         glutInitWindowSize(640, 480)
-        glutInitDisplayMode(GLUT_SINGLE | GLUT_RGB)
+        glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
         glutCreateWindow(b"3D Modeller")
         glutDisplayFunc(self.render)  # draw callback
+        glutReshapeFunc(self._on_reshape)
+        self._size       = (640, 480)
+        self._proj_dirty = True       # projection must be rebuilt for _size
+        self._projection = None       # cached GL_PROJECTION_MATRIX
+        self._inv_projection = None   # its inverse (row-major), for get_ray
 
     def init_opengl(self):
-        # Keep copies of ModelView and its inverse to convert between spaces
-        self.modelView        = numpy.identity(4)
+        # Keep copies of ModelView and its inverse to convert between spaces.
+        # GL writes the column-major matrix straight into _mv_buf, so its
+        # transpose view *is* the row-major modelView; nothing is reallocated.
+        self._mv_buf          = numpy.identity(4, dtype=numpy.float32)
+        self.modelView        = self._mv_buf.T
         self.inverseModelView = numpy.identity(4)
 
         glEnable(GL_CULL_FACE)
@@ -52,6 +76,7 @@ class Viewer(object):
         glEnable(GL_DEPTH_TEST)
 
         # Basic headlight
+        glEnable(GL_LIGHTING)
         glEnable(GL_LIGHT0)
         glLightfv(GL_LIGHT0, GL_POSITION, GLfloat_4(0, 0, 1, 0))
         glLightfv(GL_LIGHT0, GL_SPOT_DIRECTION, GLfloat_3(0, 0, -1))
@@ -77,6 +102,7 @@ class Viewer(object):
         self.interaction.register_callback('place',        self.place)
         self.interaction.register_callback('rotate_color', self.rotate_color)
         self.interaction.register_callback('scale',        self.scale)
+        self.interaction.register_callback('view_changed', self.mark_dirty)
 
     # --------------------------- main loop -----------------------------
     def main_loop(self):
@@ -84,20 +110,33 @@ class Viewer(object):
 
     # -------------------------- view helpers ---------------------------
     def init_view(self):
-        """(Re)build projection matrix for the current window size."""
-        w, h = glutGet(GLUT_WINDOW_WIDTH), glutGet(GLUT_WINDOW_HEIGHT)
-        aspect = float(w) / float(h)
+        """
+        Load the projection matrix, rebuilding it only after a resize; the
+        rest of the time the cached copy from the last rebuild is reused.
+        """
         glMatrixMode(GL_PROJECTION)
+        if not self._proj_dirty:
+            glLoadMatrixf(self._projection)
+            return
+        w, h = self._size
+        aspect = float(w) / float(h)
         glLoadIdentity()
         glViewport(0, 0, w, h)
         gluPerspective(70, aspect, 0.1, 1000.0)  # <- single place we set perspective
         glTranslated(0, 0, -15)                  # pull the whole scene "back"
+        self._projection = glGetFloatv(GL_PROJECTION_MATRIX)
+        self._inv_projection = inv(numpy.array(glGetDoublev(GL_PROJECTION_MATRIX)).T)
+        self._proj_dirty = False
+
+    def _on_reshape(self, w, h):
+        """GLUT resize callback: defer the projection rebuild to init_view."""
+        self._size       = (w, max(h, 1))
+        self._proj_dirty = True
 
     def render(self):
         """One frame: set matrices, draw the scene, then the grid."""
         self.init_view()
 
-        glEnable(GL_LIGHTING)
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
         glMatrixMode(GL_MODELVIEW)
@@ -109,37 +148,47 @@ class Viewer(object):
         glTranslated(tx, ty, tz)
         glMultMatrixf(self.interaction.trackball.matrix)
 
-        # Cache MV and its inverse for ray generation & space conversion
-        mv = numpy.array(glGetFloatv(GL_MODELVIEW_MATRIX))
-        self.modelView        = mv.T
-        self.inverseModelView = inv(mv.T)
+        # Cache MV and its inverse for ray generation & space conversion;
+        # they only change when the view does, not on every redraw
+        if self._dirty:
+            glGetFloatv(GL_MODELVIEW_MATRIX, self._mv_buf)
+            _rigid_inv(self.modelView, self.inverseModelView)
+            self._dirty = False
 
         # Draw all nodes (with lighting)
         self.scene.render()
 
-        # Draw ground plane without lighting for contrast
-        glDisable(GL_LIGHTING)
+        # Draw ground plane (the list turns lighting off and back on itself)
         glCallList(G_OBJ_PLANE)
         glPopMatrix()
-        glFlush()
+        glutSwapBuffers()
 
     # ---------------------- interaction callbacks ---------------------
+    def mark_dirty(self):
+        self._dirty = True
+
     def get_ray(self, x, y):
         """
         Convert 2D mouse coords into a 3D ray (camera space), by unprojecting
         near & far points and normalizing the direction.
+
+        Same as gluUnProject at depths 0.001/0.999 with an identity modelview,
+        but both points go through the cached inverse projection in one go.
         """
-        self.init_view()               # ensure projection matches current size
-        glMatrixMode(GL_MODELVIEW); glLoadIdentity()
-        start = numpy.array(gluUnProject(x, y, 0.001))
-        end   = numpy.array(gluUnProject(x, y, 0.999))
+        if self._proj_dirty:
+            self.init_view()           # ensure projection matches current size
+        w, h = self._size
+        nx, ny = 2.0*x/w - 1.0, 2.0*y/h - 1.0      # window → normalized device
+        points = numpy.array(((nx, ny, -0.998, 1.0),
+                              (nx, ny,  0.998, 1.0))).dot(self._inv_projection.T)
+        start, end = points[:, :3] / points[:, 3:]
         direction = end - start
         direction = direction / norm(direction)
         return start, direction
 
     def pick(self, x, y):
         start, direction = self.get_ray(x, y)
-        self.scene.pick(start, direction, self.modelView)
+        self.scene.pick(start, direction, self.modelView, self.inverseModelView)
 
     def move(self, x, y):
         start, direction = self.get_ray(x, y)